@@ -1,7 +1,5 @@
 import pygame
 import os
-from PIL import Image
-import textwrap
 
 class SymbolKeyboard:
     def __init__(self):
@@ -10,7 +8,13 @@ class SymbolKeyboard:
         # Window settings
         self.WINDOW_WIDTH = 1200
         self.WINDOW_HEIGHT = 800
-        self.screen = pygame.display.set_mode((self.WINDOW_WIDTH, self.WINDOW_HEIGHT))
+        # Hardware-presented, double-buffered window; vsync paces presentation
+        # where the driver supports it and clock.tick() covers the rest
+        self.screen = pygame.display.set_mode(
+            (self.WINDOW_WIDTH, self.WINDOW_HEIGHT),
+            pygame.SCALED | pygame.DOUBLEBUF,
+            vsync=1
+        )
         pygame.display.set_caption("Symbol Keyboard")
         
         # Colors
@@ -23,6 +27,7 @@ class SymbolKeyboard:
         self.KEY_SIZE = 60
         self.KEY_SPACING = 10
         self.SPACE_BAR_WIDTH = 300  # Width for space bar
+        self.KEYBOARD_Y = 400  # Starting Y position for the keyboard
         self.KEY_ROWS = [
             "QWERTYUIOP",
             "ASDFGHJKL",
@@ -32,18 +37,40 @@ class SymbolKeyboard:
         
         # Text input area
         self.text_input = ""
+        self.text_rect = pygame.Rect(50, 50, self.WINDOW_WIDTH - 100, 300)
+        self._text_surface = pygame.Surface(self.text_rect.size).convert()
+        self._text_layout_dirty = True
         self.font = pygame.font.Font(None, 36)
         
+        # Rasterize each key label once
+        self._glyph_cache = {
+            key: self.font.render(key, True, self.BLACK).convert_alpha()
+            for row in self.KEY_ROWS[:-1] for key in row
+        }
+        self._glyph_cache["SPACE"] = self.font.render("SPACE", True, self.BLACK).convert_alpha()
+        
         # Load symbols
         self.symbols = self._load_symbols()
         self.key_to_symbol = self._create_key_mapping()
         
+        # Key positions and screen regions that need repainting
+        self._key_layout = self._build_layout()
+        self.key_rects = dict(self._key_layout)
+        self.dirty_rects = []
+        
+        # Pre-rendered keyboard in the unpressed state, plus a pressed variant per key
+        self._keyboard_bg = self._render_keyboard_background()
+        self._pressed_key_surfaces = {
+            key: self._render_single_key(key, True) for key in self.key_rects
+        }
+        
         # Pressed keys tracking
         self.pressed_keys = set()
         
     def _load_symbols(self):
         """Load all symbol images from the generated_symbols folder."""
         symbols = {}
+        images = {}
         symbol_dir = "generated_symbols"
         if not os.path.exists(symbol_dir):
             raise FileNotFoundError("Generated symbols folder not found!")
@@ -53,16 +80,19 @@ class SymbolKeyboard:
                 number = int(filename.split("_")[1].split(".")[0])
                 image_path = os.path.join(symbol_dir, filename)
                 
-                # Load with PIL first to ensure consistent format
-                pil_image = Image.open(image_path)
-                pil_image = pil_image.resize((self.KEY_SIZE - 10, self.KEY_SIZE - 10))
-                # Convert PIL image to Pygame surface
-                mode = pil_image.mode
-                size = pil_image.size
-                data = pil_image.tobytes()
-                py_image = pygame.image.fromstring(data, size, mode)
+                # Load and scale directly in SDL, converted to the display format
+                py_image = pygame.image.load(image_path).convert()
+                py_image = pygame.transform.smoothscale(py_image, (self.KEY_SIZE - 10, self.KEY_SIZE - 10))
                 
-                symbols[number] = py_image
+                images[number] = py_image
+                
+        # Pack every symbol into one atlas surface; symbols maps to source rects
+        tile = self.KEY_SIZE - 10
+        self._atlas = pygame.Surface((len(images) * tile, tile))
+        for i, number in enumerate(sorted(images)):
+            self._atlas.blit(images[number], (i * tile, 0))
+            symbols[number] = pygame.Rect(i * tile, 0, tile, tile)
+        self._atlas = self._atlas.convert()
         return symbols
         
     def _create_key_mapping(self):
@@ -75,28 +105,16 @@ class SymbolKeyboard:
                 symbol_index += 1
         return mapping
         
-    def draw_keyboard(self):
-        """Draw the keyboard with symbols."""
-        start_y = 400  # Starting Y position for the keyboard
+    def _build_layout(self):
+        """Compute a flat (key, rect) table for every key, including the space bar."""
+        layout = []
         
         for row_index, row in enumerate(self.KEY_ROWS):
+            y = self.KEYBOARD_Y + row_index * (self.KEY_SIZE + self.KEY_SPACING)
             if row == " ":  # Space bar row
                 # Center the space bar
                 x = (self.WINDOW_WIDTH - self.SPACE_BAR_WIDTH) // 2
-                y = start_y + row_index * (self.KEY_SIZE + self.KEY_SPACING)
-                
-                # Draw space bar
-                space_rect = pygame.Rect(x, y, self.SPACE_BAR_WIDTH, self.KEY_SIZE)
-                is_pressed = " " in self.pressed_keys
-                color = self.LIGHT_BLUE if is_pressed else self.WHITE
-                pygame.draw.rect(self.screen, color, space_rect)
-                pygame.draw.rect(self.screen, self.BLACK, space_rect, 2)
-                
-                # Draw "SPACE" text
-                space_text = self.font.render("SPACE", True, self.BLACK)
-                text_x = x + (self.SPACE_BAR_WIDTH - space_text.get_width()) // 2
-                text_y = y + (self.KEY_SIZE - space_text.get_height()) // 2
-                self.screen.blit(space_text, (text_x, text_y))
+                layout.append((" ", pygame.Rect(x, y, self.SPACE_BAR_WIDTH, self.KEY_SIZE)))
             else:
                 # Regular key row
                 row_width = len(row) * (self.KEY_SIZE + self.KEY_SPACING)
@@ -104,95 +122,186 @@ class SymbolKeyboard:
                 
                 for col_index, key in enumerate(row):
                     x = start_x + col_index * (self.KEY_SIZE + self.KEY_SPACING)
-                    y = start_y + row_index * (self.KEY_SIZE + self.KEY_SPACING)
-                    
-                    # Draw key background
-                    key_rect = pygame.Rect(x, y, self.KEY_SIZE, self.KEY_SIZE)
-                    is_pressed = key in self.pressed_keys
-                    color = self.LIGHT_BLUE if is_pressed else self.WHITE
-                    pygame.draw.rect(self.screen, color, key_rect)
-                    pygame.draw.rect(self.screen, self.BLACK, key_rect, 2)
-                    
-                    # Draw symbol
-                    symbol_index = self.key_to_symbol.get(key)
-                    if symbol_index in self.symbols:
-                        symbol_surf = self.symbols[symbol_index]
-                        symbol_x = x + (self.KEY_SIZE - symbol_surf.get_width()) // 2
-                        symbol_y = y + (self.KEY_SIZE - symbol_surf.get_height()) // 2
-                        self.screen.blit(symbol_surf, (symbol_x, symbol_y))
-                    
-                    # Draw key letter
-                    letter_surf = self.font.render(key, True, self.BLACK)
-                    letter_x = x + (self.KEY_SIZE - letter_surf.get_width()) // 2
-                    letter_y = y + self.KEY_SIZE - 20
-                    self.screen.blit(letter_surf, (letter_x, letter_y))
-                
-    def draw_text_input(self):
-        """Draw the text input area with the typed symbols."""
-        # Draw input box
-        input_rect = pygame.Rect(50, 50, self.WINDOW_WIDTH - 100, 300)
-        pygame.draw.rect(self.screen, self.WHITE, input_rect)
-        pygame.draw.rect(self.screen, self.BLACK, input_rect, 2)
+                    layout.append((key, pygame.Rect(x, y, self.KEY_SIZE, self.KEY_SIZE)))
+        return layout
+        
+    def _render_single_key(self, key, pressed):
+        """Render one key, with its symbol and label, onto a new surface."""
+        width, height = self.key_rects[key].size
+        surface = pygame.Surface((width, height)).convert()
+        
+        # Draw key background
+        surface.fill(self.LIGHT_BLUE if pressed else self.WHITE)
+        pygame.draw.rect(surface, self.BLACK, surface.get_rect(), 2)
+        
+        if key == " ":
+            # Draw "SPACE" text
+            space_text = self._glyph_cache["SPACE"]
+            text_x = (width - space_text.get_width()) // 2
+            text_y = (height - space_text.get_height()) // 2
+            surface.blit(space_text, (text_x, text_y))
+            return surface
         
-        # Draw symbols in text input
-        x, y = 60, 60
+        # Draw symbol
+        symbol_index = self.key_to_symbol.get(key)
+        if symbol_index in self.symbols:
+            symbol_rect = self.symbols[symbol_index]
+            symbol_x = (width - symbol_rect.width) // 2
+            symbol_y = (height - symbol_rect.height) // 2
+            surface.blit(self._atlas, (symbol_x, symbol_y), symbol_rect)
+        
+        # Draw key letter
+        letter_surf = self._glyph_cache[key]
+        letter_x = (width - letter_surf.get_width()) // 2
+        letter_y = height - 20
+        surface.blit(letter_surf, (letter_x, letter_y))
+        return surface
+        
+    def _render_keyboard_background(self):
+        """Render the whole keyboard, all keys unpressed, onto one surface."""
+        background = pygame.Surface((self.WINDOW_WIDTH, self.WINDOW_HEIGHT - self.KEYBOARD_Y)).convert()
+        background.fill(self.GRAY)
+        for key, key_rect in self._key_layout:
+            background.blit(self._render_single_key(key, False), key_rect.move(0, -self.KEYBOARD_Y))
+        return background
+        
+    def draw_key(self, key):
+        """Draw a single key in its current pressed/unpressed state."""
+        key_rect = self.key_rects[key]
+        if key in self.pressed_keys:
+            self.screen.blit(self._pressed_key_surfaces[key], key_rect)
+        else:
+            self.screen.blit(self._keyboard_bg, key_rect, key_rect.move(0, -self.KEYBOARD_Y))
+        
+    def draw_keyboard(self):
+        """Draw the keyboard with symbols."""
+        self.screen.blit(self._keyboard_bg, (0, self.KEYBOARD_Y))
+        for key in self.pressed_keys:
+            self.screen.blit(self._pressed_key_surfaces[key], self.key_rects[key])
+                
+    def _build_text_layout(self):
+        """Wrap the typed text into (atlas source rect, screen position) pairs."""
+        layout = []
+        left, top = 60, 60
+        x, y = left, top
         line_height = self.KEY_SIZE
         max_width = self.WINDOW_WIDTH - 120
         
-        # Wrap text into lines
-        wrapped_text = textwrap.wrap(self.text_input, width=50)
-        
-        for line in wrapped_text:
-            x = 60  # Reset x position for each line
-            for char in line:
-                if char == " ":  # Handle space
-                    x += self.KEY_SIZE // 2
-                elif char.upper() in self.key_to_symbol:
-                    symbol_index = self.key_to_symbol[char.upper()]
-                    if symbol_index in self.symbols:
-                        symbol_surf = self.symbols[symbol_index]
-                        if x + symbol_surf.get_width() > max_width:
-                            x = 60
-                            y += line_height
-                        self.screen.blit(symbol_surf, (x, y))
-                        x += symbol_surf.get_width() + 5
-            y += line_height
+        # Word-wrap in a single pass using the known symbol widths; words
+        # wider than a full line are broken at the right edge
+        for word in self.text_input.split(" "):
+            word_symbols = []
+            for char in word:
+                symbol_index = self.key_to_symbol.get(char.upper())
+                if symbol_index in self.symbols:
+                    word_symbols.append(self.symbols[symbol_index])
+            word_width = sum(rect.width + 5 for rect in word_symbols) - 5
+            if x > left and x + word_width > max_width:
+                x = left
+                y += line_height
+            
+            for symbol_rect in word_symbols:
+                if x + symbol_rect.width > max_width:
+                    x = left
+                    y += line_height
+                layout.append((symbol_rect, (x, y)))
+                x += symbol_rect.width + 5
+            x += self.KEY_SIZE // 2  # Handle space
+        return layout
+        
+    def _render_text_surface(self):
+        """Re-render the input box and the wrapped symbols onto the off-screen text surface."""
+        self._text_surface.fill(self.WHITE)
+        
+        # Draw symbols in text input, clipped to the box
+        left, top = self.text_rect.topleft
+        for src_rect, (x, y) in self._build_text_layout():
+            self._text_surface.blit(self._atlas, (x - left, y - top), src_rect)
+        
+        # Draw the border last so overflowing symbols cannot cover it
+        pygame.draw.rect(self._text_surface, self.BLACK, self._text_surface.get_rect(), 2)
+        
+    def draw_text_input(self):
+        """Draw the text input area with the typed symbols."""
+        # Re-render only when the text has changed since the last draw
+        if self._text_layout_dirty:
+            self._render_text_surface()
+            self._text_layout_dirty = False
+        
+        self.screen.blit(self._text_surface, self.text_rect)
+            
+    def _mark_dirty(self, *rects):
+        """Queue screen regions for repainting on the next frame."""
+        for rect in rects:
+            if rect not in self.dirty_rects:
+                self.dirty_rects.append(rect)
+            
+    def redraw_dirty(self):
+        """Repaint and present only the regions queued in dirty_rects."""
+        if not self.dirty_rects:
+            return
+        for key, key_rect in self._key_layout:
+            if key_rect in self.dirty_rects:
+                self.draw_key(key)
+        if self.text_rect in self.dirty_rects:
+            self.draw_text_input()
+        pygame.display.update(self.dirty_rects)
+        self.dirty_rects = []
             
     def run(self):
         """Main loop for the keyboard interface."""
         running = True
+        needs_full_redraw = True
         clock = pygame.time.Clock()
         
         while running:
-            for event in pygame.event.get():
+            # Draw everything on the first frame or after an expose,
+            # otherwise only what changed
+            if needs_full_redraw:
+                self.screen.fill(self.GRAY)
+                self.draw_text_input()
+                self.draw_keyboard()
+                pygame.display.flip()
+                self.dirty_rects = []
+                needs_full_redraw = False
+            else:
+                self.redraw_dirty()
+            
+            # Cap the redraw rate, then sleep until input arrives instead of
+            # polling; everything already queued is handled in one batch
+            clock.tick(60)
+            for event in [pygame.event.wait()] + pygame.event.get():
                 if event.type == pygame.QUIT:
                     running = False
                     
+                elif event.type == pygame.VIDEOEXPOSE:
+                    needs_full_redraw = True
+                    
                 elif event.type == pygame.KEYDOWN:
                     if event.key == pygame.K_SPACE:
                         self.text_input += " "
+                        self._text_layout_dirty = True
                         self.pressed_keys.add(" ")
+                        self._mark_dirty(self.key_rects[" "], self.text_rect)
                     elif event.unicode.upper() in self.key_to_symbol:
                         self.text_input += event.unicode
+                        self._text_layout_dirty = True
                         self.pressed_keys.add(event.unicode.upper())
+                        self._mark_dirty(self.key_rects[event.unicode.upper()], self.text_rect)
                     elif event.key == pygame.K_BACKSPACE:
                         self.text_input = self.text_input[:-1]
+                        self._text_layout_dirty = True
+                        self._mark_dirty(self.text_rect)
                     elif event.key == pygame.K_ESCAPE:
                         running = False
                         
                 elif event.type == pygame.KEYUP:
                     if event.key == pygame.K_SPACE:
-                        self.pressed_keys.remove(" ")
+                        self.pressed_keys.discard(" ")
+                        self._mark_dirty(self.key_rects[" "])
                     elif event.unicode.upper() in self.key_to_symbol:
-                        self.pressed_keys.remove(event.unicode.upper())
-            
-            # Draw everything
-            self.screen.fill(self.GRAY)
-            self.draw_text_input()
-            self.draw_keyboard()
-            pygame.display.flip()
-            
-            clock.tick(60)
+                        self.pressed_keys.discard(event.unicode.upper())
+                        self._mark_dirty(self.key_rects[event.unicode.upper()])
             
         pygame.quit()
 
@@ -1,250 +1,234 @@
-import random
 import math
-from typing import List, Tuple
+import itertools
+import functools
 import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Optional
 from PIL import Image, ImageDraw
-import hashlib
 import numpy as np
 
+@functools.lru_cache(maxsize=64)
+def _angle_table(n: int) -> np.ndarray:
+    """Angles of n evenly spaced points around a circle, shared between calls."""
+    angles = np.arange(n) * (math.tau / n)
+    angles.setflags(write=False)
+    return angles
+
 class SymbolGenerator:
     def __init__(self, size: int = 500):
         self.size = size
         self.margin = size // 10
         self.effective_size = size - 2 * self.margin
         self.center = size // 2
-        self.generated_hashes = set()
         
-    def _get_symbol_hash(self, image: Image.Image) -> str:
-        img_array = np.array(image)
-        img_small = Image.fromarray(img_array).resize((50, 50))
-        return hashlib.md5(np.array(img_small).tobytes()).hexdigest()
-
-    def _is_unique(self, image: Image.Image) -> bool:
-        symbol_hash = self._get_symbol_hash(image)
-        if symbol_hash in self.generated_hashes:
-            return False
-        self.generated_hashes.add(symbol_hash)
-        return True
-
-    def _generate_base_shape(self) -> List[Tuple[float, float]]:
-        shape_type = random.choice([
+        # Cubic Bernstein basis for the 21 samples along a calligraphic stroke
+        t = np.linspace(0, 1, 21)[:, None]
+        i = np.arange(4)
+        self._bezier_basis_21x4 = np.array([1, 3, 3, 1]) * (1 - t)**(3 - i) * t**i
+        
+        # Choices drawn from for every symbol, built once
+        self._shape_types = [
             self._generate_calligraphic_stroke,
             self._generate_radical,
             self._generate_flowing_curve,
             self._generate_glyph_structure,
             self._generate_logographic,
             self._generate_pictographic
-        ])
-        return shape_type()
+        ]
+        self._decoration_types = ['serifs', 'dots', 'strokes', 'none']
+        
+        # Grayscale canvas reused by every symbol this generator draws
+        self._canvas = Image.new('L', (size, size), 'white')
+        self._draw = ImageDraw.Draw(self._canvas)
+        
+    def _generate_base_shape(self, rng: np.random.Generator) -> np.ndarray:
+        shape_type = self._shape_types[rng.integers(len(self._shape_types))]
+        return shape_type(rng)
     
-    def _generate_calligraphic_stroke(self) -> List[Tuple[float, float]]:
+    def _generate_calligraphic_stroke(self, rng: np.random.Generator) -> np.ndarray:
         """Generate a stroke that looks like calligraphy."""
-        points = []
-        start_x = self.center - self.effective_size * random.uniform(0.2, 0.3)
-        start_y = self.center + self.effective_size * random.uniform(0.2, 0.3)
+        start_x = self.center - self.effective_size * rng.uniform(0.2, 0.3)
+        start_y = self.center + self.effective_size * rng.uniform(0.2, 0.3)
         
         # Create main stroke
-        control_points = [
+        control_points = np.array([
             (start_x, start_y),
-            (start_x + random.uniform(50, 100), start_y - random.uniform(50, 100)),
-            (start_x + random.uniform(150, 200), start_y - random.uniform(150, 200)),
-            (start_x + random.uniform(250, 300), start_y - random.uniform(50, 100))
-        ]
+            (start_x + rng.uniform(50, 100), start_y - rng.uniform(50, 100)),
+            (start_x + rng.uniform(150, 200), start_y - rng.uniform(150, 200)),
+            (start_x + rng.uniform(250, 300), start_y - rng.uniform(50, 100))
+        ])
         
         # Generate smooth curve through control points
-        for t in range(0, 101, 5):
-            t = t / 100
-            x = sum(p[0] * self._bezier_coeff(i, 3, t) for i, p in enumerate(control_points))
-            y = sum(p[1] * self._bezier_coeff(i, 3, t) for i, p in enumerate(control_points))
-            points.append((x, y))
-            
-        return points
+        return self._bezier_basis_21x4 @ control_points
     
-    def _bezier_coeff(self, i: int, n: int, t: float) -> float:
-        return math.comb(n, i) * (1 - t)**(n - i) * t**i
-    
-    def _generate_radical(self) -> List[Tuple[float, float]]:
+    def _generate_radical(self, rng: np.random.Generator) -> np.ndarray:
         """Generate a shape reminiscent of radicals in logographic writing systems."""
-        points = []
-        num_strokes = random.randint(2, 4)
-        base_x = self.center - self.effective_size * 0.25
-        base_y = self.center + self.effective_size * 0.25
-        
-        for _ in range(num_strokes):
-            stroke_length = random.uniform(0.3, 0.5) * self.effective_size
-            angle = random.uniform(-math.pi/4, math.pi/4)
-            
-            points.extend([
-                (base_x, base_y),
-                (base_x + math.cos(angle) * stroke_length,
-                 base_y - math.sin(angle) * stroke_length)
-            ])
-            
-            base_x += random.uniform(30, 50)
-            base_y -= random.uniform(20, 40)
-            
-        return points
+        num_strokes = rng.integers(2, 5)
+        stroke_length = rng.uniform(0.3, 0.5, num_strokes) * self.effective_size
+        angle = rng.uniform(-math.pi/4, math.pi/4, num_strokes)
+        
+        # Each stroke starts a little up and to the right of the previous one
+        base_x = self.center - self.effective_size * 0.25 + np.concatenate(
+            ([0.0], np.cumsum(rng.uniform(30, 50, num_strokes - 1))))
+        base_y = self.center + self.effective_size * 0.25 - np.concatenate(
+            ([0.0], np.cumsum(rng.uniform(20, 40, num_strokes - 1))))
+        
+        starts = np.column_stack([base_x, base_y])
+        ends = np.column_stack([base_x + np.cos(angle) * stroke_length,
+                                base_y - np.sin(angle) * stroke_length])
+        return np.stack([starts, ends], axis=1).reshape(-1, 2)
     
-    def _generate_flowing_curve(self) -> List[Tuple[float, float]]:
+    def _generate_flowing_curve(self, rng: np.random.Generator) -> np.ndarray:
         """Generate a flowing, script-like curve."""
-        points = []
-        num_points = random.randint(8, 12)
-        amplitude = self.effective_size * random.uniform(0.1, 0.2)
-        frequency = random.uniform(1, 2)
-        
-        for i in range(num_points):
-            t = i / (num_points - 1)
-            x = self.center - self.effective_size * 0.3 + t * self.effective_size * 0.6
-            y = self.center + amplitude * math.sin(frequency * math.pi * t)
-            points.append((x, y))
-        
-        return points
+        num_points = rng.integers(8, 13)
+        amplitude = self.effective_size * rng.uniform(0.1, 0.2)
+        frequency = rng.uniform(1, 2)
+        
+        t = np.linspace(0, 1, num_points)
+        # Fold scalar factors first so each coordinate costs one array multiply
+        x = (self.center - self.effective_size * 0.3) + t * (self.effective_size * 0.6)
+        y = self.center + amplitude * np.sin(t * (frequency * math.pi))
+        return np.stack([x, y], axis=1)
     
-    def _generate_glyph_structure(self) -> List[Tuple[float, float]]:
+    def _generate_glyph_structure(self, rng: np.random.Generator) -> np.ndarray:
         """Generate a structure similar to complex glyphs."""
-        points = []
-        num_components = random.randint(2, 4)
-        
-        for _ in range(num_components):
-            component_points = []
-            size = self.effective_size * random.uniform(0.15, 0.25)
-            x_offset = random.uniform(-0.2, 0.2) * self.effective_size
-            y_offset = random.uniform(-0.2, 0.2) * self.effective_size
-            
-            for i in range(4):
-                angle = (i * math.pi / 2) + random.uniform(-0.2, 0.2)
-                x = self.center + math.cos(angle) * size + x_offset
-                y = self.center + math.sin(angle) * size + y_offset
-                component_points.append((x, y))
-            
-            points.extend(component_points)
-        
-        return points
+        num_components = rng.integers(2, 5)
+        
+        # One row per component, four roughly square corners each
+        size = self.effective_size * rng.uniform(0.15, 0.25, (num_components, 1))
+        x_offset = rng.uniform(-0.2, 0.2, (num_components, 1)) * self.effective_size
+        y_offset = rng.uniform(-0.2, 0.2, (num_components, 1)) * self.effective_size
+        angles = _angle_table(4) + rng.uniform(-0.2, 0.2, (num_components, 4))
+        
+        x = self.center + np.cos(angles) * size + x_offset
+        y = self.center + np.sin(angles) * size + y_offset
+        return np.stack([x, y], axis=-1).reshape(-1, 2)
     
-    def _generate_logographic(self) -> List[Tuple[float, float]]:
+    def _generate_logographic(self, rng: np.random.Generator) -> np.ndarray:
         """Generate a pattern similar to logographic characters."""
-        points = []
-        num_strokes = random.randint(3, 5)
+        num_strokes = rng.integers(3, 6)
         base_size = self.effective_size * 0.3
         
-        for _ in range(num_strokes):
-            stroke_type = random.choice(['horizontal', 'vertical', 'diagonal'])
-            x_offset = random.uniform(-0.2, 0.2) * self.effective_size
-            y_offset = random.uniform(-0.2, 0.2) * self.effective_size
-            
-            if stroke_type == 'horizontal':
-                points.extend([
-                    (self.center - base_size/2 + x_offset, self.center + y_offset),
-                    (self.center + base_size/2 + x_offset, self.center + y_offset)
-                ])
-            elif stroke_type == 'vertical':
-                points.extend([
-                    (self.center + x_offset, self.center - base_size/2 + y_offset),
-                    (self.center + x_offset, self.center + base_size/2 + y_offset)
-                ])
-            else:  # diagonal
-                angle = random.uniform(0, math.pi)
-                points.extend([
-                    (self.center - math.cos(angle) * base_size/2 + x_offset,
-                     self.center - math.sin(angle) * base_size/2 + y_offset),
-                    (self.center + math.cos(angle) * base_size/2 + x_offset,
-                     self.center + math.sin(angle) * base_size/2 + y_offset)
-                ])
-        
-        return points
+        # Stroke types: 0 horizontal, 1 vertical, 2 diagonal at a random angle
+        stroke_type = rng.integers(0, 3, num_strokes)
+        angle = np.where(stroke_type == 0, 0.0,
+                         np.where(stroke_type == 1, math.pi / 2,
+                                  rng.uniform(0, math.pi, num_strokes)))
+        middle = self.center + rng.uniform(-0.2, 0.2, (num_strokes, 2)) * self.effective_size
+        half = np.column_stack([np.cos(angle), np.sin(angle)]) * base_size / 2
+        
+        return np.stack([middle - half, middle + half], axis=1).reshape(-1, 2)
     
-    def _generate_pictographic(self) -> List[Tuple[float, float]]:
+    def _generate_pictographic(self, rng: np.random.Generator) -> np.ndarray:
         """Generate simplified pictographic-like symbols."""
-        points = []
-        num_elements = random.randint(3, 6)
+        num_elements = rng.integers(3, 7)
         radius = self.effective_size * 0.25
         
-        for i in range(num_elements):
-            angle = (i * 2 * math.pi / num_elements) + random.uniform(-0.2, 0.2)
-            r = radius * random.uniform(0.8, 1.2)
-            x = self.center + math.cos(angle) * r
-            y = self.center + math.sin(angle) * r
-            points.append((x, y))
-            
-            if random.random() < 0.5:  # Add connecting lines
-                x2 = self.center + math.cos(angle + math.pi/num_elements) * r * 0.7
-                y2 = self.center + math.sin(angle + math.pi/num_elements) * r * 0.7
-                points.append((x2, y2))
-        
-        return points
+        angle = _angle_table(num_elements) + rng.uniform(-0.2, 0.2, num_elements)
+        r = radius * rng.uniform(0.8, 1.2, num_elements)
+        outer = np.column_stack([self.center + np.cos(angle) * r,
+                                 self.center + np.sin(angle) * r])
+        
+        # Add connecting lines after roughly half of the outer points
+        connector_angle = angle + math.pi / num_elements
+        connector_r = r * 0.7
+        connectors = np.column_stack([self.center + np.cos(connector_angle) * connector_r,
+                                      self.center + np.sin(connector_angle) * connector_r])
+        keep = np.column_stack([np.ones(num_elements, dtype=bool),
+                                rng.random(num_elements) < 0.5])
+        return np.stack([outer, connectors], axis=1)[keep]
 
-    def _add_decoration(self, draw: ImageDraw.Draw, points: List[Tuple[float, float]]):
+    def _add_decoration(self, draw: ImageDraw.Draw, points: np.ndarray, rng: np.random.Generator):
         """Add script-like decorative elements."""
-        decoration_type = random.choice(['serifs', 'dots', 'strokes', 'none'])
+        decoration_type = self._decoration_types[rng.integers(len(self._decoration_types))]
         
+        # Decoration geometry is computed for all chosen points at once;
+        # only the PIL draw calls remain per element
         if decoration_type == 'serifs':
-            serif_length = random.randint(5, 15)
-            for point in random.sample(points, len(points)//2):
-                angle = random.uniform(0, math.pi)
-                draw.line([
-                    (point[0] - math.cos(angle) * serif_length,
-                     point[1] - math.sin(angle) * serif_length),
-                    (point[0] + math.cos(angle) * serif_length,
-                     point[1] + math.sin(angle) * serif_length)
-                ], fill='black', width=2)
+            serif_length = rng.integers(5, 16)
+            chosen = points[rng.choice(len(points), len(points)//2, replace=False)]
+            angle = rng.uniform(0, math.pi, len(chosen))
+            offset = np.column_stack([np.cos(angle), np.sin(angle)]) * serif_length
+            for segment in np.hstack([chosen - offset, chosen + offset]).tolist():
+                draw.line(segment, fill='black', width=2)
                 
         elif decoration_type == 'dots':
-            for point in random.sample(points, len(points)//3):
-                dot_size = random.randint(3, 6)
-                draw.ellipse([
-                    (point[0] - dot_size, point[1] - dot_size),
-                    (point[0] + dot_size, point[1] + dot_size)
-                ], fill='black')
+            chosen = points[rng.choice(len(points), len(points)//3, replace=False)]
+            dot_size = rng.integers(3, 7, (len(chosen), 1))
+            for box in np.hstack([chosen - dot_size, chosen + dot_size]).tolist():
+                draw.ellipse(box, fill='black')
                 
         elif decoration_type == 'strokes':
-            stroke_length = random.randint(10, 20)
-            for point in random.sample(points, len(points)//3):
-                draw.line([
-                    point,
-                    (point[0] + random.uniform(-1, 1) * stroke_length,
-                     point[1] + random.uniform(-1, 1) * stroke_length)
-                ], fill='black', width=2)
+            stroke_length = rng.integers(10, 21)
+            chosen = points[rng.choice(len(points), len(points)//3, replace=False)]
+            ends = chosen + rng.uniform(-1, 1, chosen.shape) * stroke_length
+            for segment in np.hstack([chosen, ends]).tolist():
+                draw.line(segment, fill='black', width=2)
 
-    def generate_symbol(self) -> Image.Image:
-        max_attempts = 100
-        attempts = 0
-        
-        while attempts < max_attempts:
-            image = Image.new('RGB', (self.size, self.size), 'white')
-            draw = ImageDraw.Draw(image)
-            
-            points = self._generate_base_shape()
-            
-            # Draw with varying line width for calligraphic effect
-            for i in range(len(points) - 1):
-                width = random.randint(3, 6)
-                draw.line([points[i], points[i + 1]], fill='black', width=width)
-            
-            self._add_decoration(draw, points)
-            
-            if self._is_unique(image):
-                return image
-                
-            attempts += 1
+    def _render(self, seed: Optional[int]) -> Image.Image:
+        """Draw the symbol for seed onto the shared canvas and return the canvas."""
+        # Every random choice comes from one generator, so a given seed
+        # always reproduces the same symbol
+        rng = np.random.default_rng(seed)
+        draw = self._draw
+        draw.rectangle([(0, 0), (self.size, self.size)], fill='white')
         
-        raise Exception("Failed to generate a unique symbol after maximum attempts")
+        shape = self._generate_base_shape(rng)
+        # PIL takes a flat [x0, y0, x1, y1, ...] list, no per-point tuples needed
+        coords = shape.ravel().tolist()
+        
+        # Draw with varying line width for calligraphic effect, one
+        # polyline per run of consecutive segments sharing a width
+        widths = rng.integers(3, 7, len(shape) - 1).tolist()
+        start = 0
+        for width, run in itertools.groupby(widths):
+            end = start + len(list(run))
+            draw.line(coords[2 * start:2 * end + 2], fill='black', width=width, joint='curve')
+            start = end
+        
+        self._add_decoration(draw, shape, rng)
+        return self._canvas
+    
+    def generate_symbol(self, seed: Optional[int] = None) -> Image.Image:
+        return self._render(seed).copy()
     
-    def save_symbol(self, filename: str):
-        image = self.generate_symbol()
-        image.save(filename, 'PNG')
+    def save_symbol(self, filename: str, seed: Optional[int] = None):
+        # Saved straight from the shared canvas, no copy needed
+        image = self._render(seed)
+        # Symbols are pure black-on-white line art, so 1-bit PNG is lossless; they
+        # are re-scaled on load, so favour encode speed over file size
+        image = image.convert('1', dither=Image.Dither.NONE)
+        image.save(filename, 'PNG', optimize=False, compress_level=1)
+
+_worker_generator = None
+
+def _init_worker():
+    """Create the generator, and its canvas, that this worker process reuses."""
+    global _worker_generator
+    _worker_generator = SymbolGenerator()
+
+def _save_one(filename: str, seed: int) -> str:
+    _worker_generator.save_symbol(filename, seed=seed)
+    return filename
 
 def generate_multiple_symbols(num_symbols: int = 28, output_dir: str = "generated_symbols"):
     os.makedirs(output_dir, exist_ok=True)
     
-    generator = SymbolGenerator()
-    for i in range(num_symbols):
-        filename = os.path.join(output_dir, f'symbol_{i+1}.png')
-        try:
-            generator.save_symbol(filename)
-            print(f'Generated unique symbol {i+1}/28')
-        except Exception as e:
-            print(f"Error generating symbol {i+1}: {str(e)}")
-            break
+    # A distinct seed per symbol index yields distinct symbols without any
+    # retry loop, so worker processes can render and save independently
+    filenames = [os.path.join(output_dir, f'symbol_{i+1}.png') for i in range(num_symbols)]
+    seeds = [i * 0x9E3779B1 for i in range(num_symbols)]
+    # Hand indices to workers in chunks, a few per core, to cut per-task IPC
+    chunksize = max(1, num_symbols // (4 * (os.cpu_count() or 1)))
+    with ProcessPoolExecutor(initializer=_init_worker) as executor:
+        results = executor.map(_save_one, filenames, seeds, chunksize=chunksize)
+        for i in range(num_symbols):
+            try:
+                next(results)
+                print(f'Generated unique symbol {i+1}/{num_symbols}')
+            except Exception as e:
+                print(f"Error generating symbol {i+1}: {str(e)}")
+                break
 
 if __name__ == "__main__":
     print("Generating 28 unique symbols...")